@@ -9,6 +9,7 @@ from unidep._conflicts import (
     _combine_pinning_within_platform,
     _is_redundant,
     _is_valid_pinning,
+    _non_redundant_pinnings,
     _parse_pinning,
     combine_version_pinnings,
 )
@@ -140,6 +141,24 @@ def test_general_contradictory_pinnings() -> None:
         combine_version_pinnings([">=2", "<1"])
 
 
+def test_combine_duplicate_spelled_pinnings() -> None:
+    # The same bound spelled with different whitespace must collapse to a
+    # single kept pin, not be dropped as mutually redundant
+    assert combine_version_pinnings(["<2", "< 2"]) == "<2"
+    assert combine_version_pinnings([">= 1", ">=1"]) == ">=1"
+    assert combine_version_pinnings(["< 2", ">0.5,<2"]) == "<2,>0.5"
+    # Likewise an exact pin spelled twice is one pin, not a conflict
+    assert combine_version_pinnings(["=1", "= 1"]) == "=1"
+
+
+def test_non_redundant_pinnings() -> None:
+    assert _non_redundant_pinnings(["<3", "<=3", "<4"]) == ["<3"]
+    assert _non_redundant_pinnings([">1", ">=1", "!=5"]) == [">1", "!=5"]
+    # Equal bounds spelled as different version strings eliminate each
+    # other, matching `_is_redundant`'s behavior
+    assert _non_redundant_pinnings(["<2", "<2.0"]) == []
+
+
 def test_is_redundant() -> None:
     assert _is_redundant(">2", [">5"])
     assert not _is_redundant(">5", [">2"])
@@ -5,14 +5,15 @@ Verion conflict detections and resolution.
 
 from __future__ import annotations
 
+import functools
+import re
 import sys
-from collections import defaultdict
 from typing import TYPE_CHECKING
 
 from packaging import version
 
 from unidep.platform_definitions import Platform, Spec
-from unidep.utils import defaultdict_to_dict, warn
+from unidep.utils import warn
 
 if sys.version_info >= (3, 8):
     from typing import get_args
@@ -24,6 +25,8 @@ if TYPE_CHECKING:
     from unidep.platform_definitions import CondaPip
 
 VALID_OPERATORS = ["<=", ">=", "<", ">", "=", "!="]
+_LT_OPS = frozenset({"<", "<="})
+_GT_OPS = frozenset({">", ">="})
 _REPO_URL = "https://github.com/basnijholt/unidep"
 
 
@@ -39,18 +42,19 @@ def _prepare_specs_for_conflict_resolution(
     """
     prepared_data = {}
     for package, spec_list in requirements.items():
-        grouped_specs: dict[Platform | None, dict[CondaPip, list[Spec]]] = defaultdict(
-            lambda: defaultdict(list),
-        )
+        grouped_specs: dict[Platform | None, dict[CondaPip, list[Spec]]] = {}
         for spec in spec_list:
             _platforms = spec.platforms()
             if _platforms is None:
                 _platforms = [None]  # type: ignore[list-item]
             for _platform in _platforms:
-                grouped_specs[_platform][spec.which].append(spec)
+                grouped_specs.setdefault(_platform, {}).setdefault(
+                    spec.which,
+                    [],
+                ).append(spec)
 
         prepared_data[package] = grouped_specs
-    return defaultdict_to_dict(prepared_data)
+    return prepared_data
 
 
 def _pop_unused_platforms_and_maybe_expand_none(
@@ -81,6 +85,8 @@ def _pop_unused_platforms_and_maybe_expand_none(
 def _maybe_new_spec_with_combined_pinnings(
     specs: list[Spec],
 ) -> Spec:
+    if len(specs) == 1:  # common case: nothing to combine or select
+        return specs[0]
     pinned_specs = [m for m in specs if m.pin is not None]
     if len(pinned_specs) == 1:
         return pinned_specs[0]
@@ -191,29 +197,30 @@ def resolve_conflicts(
     prepared = _prepare_specs_for_conflict_resolution(requirements)
     for data in prepared.values():
         _pop_unused_platforms_and_maybe_expand_none(data, platforms)
-    resolved = {
-        pkg: _combine_pinning_within_platform(data) for pkg, data in prepared.items()
+    return {
+        pkg: {
+            _platform: _resolve_conda_pip_conflicts(sources)
+            for _platform, sources in _combine_pinning_within_platform(data).items()
+        }
+        for pkg, data in prepared.items()
     }
 
-    for _platforms in resolved.values():
-        for _platform, sources in _platforms.items():
-            _platforms[_platform] = _resolve_conda_pip_conflicts(sources)
-    return resolved
+
+# Anchored at the start; two-character operators must come before their
+# one-character prefixes so e.g. '<=' is not parsed as '<'.
+_PINNING_RE = re.compile(r"(<=|>=|!=|<|>|=)\s*(\S.*)$")
 
 
+@functools.lru_cache(maxsize=None)
 def _parse_pinning(pinning: str) -> tuple[str, version.Version]:
     """Separates the operator and the version number."""
     pinning = pinning.strip()
-    for operator in VALID_OPERATORS:
-        if pinning.startswith(operator):
-            version_part = pinning[len(operator) :].strip()
-            if version_part:
-                try:
-                    return operator, version.parse(version_part)
-                except version.InvalidVersion:
-                    break
-            else:
-                break  # Empty version string
+    m = _PINNING_RE.match(pinning)
+    if m is not None:
+        try:
+            return m.group(1), version.parse(m.group(2).rstrip())
+        except version.InvalidVersion:
+            pass
 
     msg = f"Invalid version pinning: '{pinning}', must start with one of {VALID_OPERATORS}"  # noqa: E501
     raise VersionConflictError(msg)
@@ -233,31 +240,99 @@ def _is_redundant(pinning: str, other_pinnings: list[str]) -> bool:
             or (other_op == "<=" and version > other_version)
         ):
             return True
-        if op == "<=" and other_op in ["<", "<="] and version >= other_version:
+        if op == "<=" and other_op in _LT_OPS and version >= other_version:
             return True
         if op == ">" and (
             (other_op == ">" and version <= other_version)
             or (other_op == ">=" and version < other_version)
         ):
             return True
-        if op == ">=" and other_op in [">", ">="] and version <= other_version:
+        if op == ">=" and other_op in _GT_OPS and version <= other_version:
             return True
 
     return False
 
 
+# For each bound operator: the sibling operator on the same side that can
+# also make it redundant.
+_SIBLING_OP = {"<": "<=", "<=": "<", ">": ">=", ">=": ">"}
+
+
+def _tightest_bounds(
+    parsed: list[tuple[str, version.Version]],
+) -> dict[str, tuple[version.Version, int]]:
+    """Map each bound operator to its tightest version and its multiplicity."""
+    best: dict[str, tuple[version.Version, int]] = {}
+    for op, ver in parsed:
+        if op not in _SIBLING_OP:
+            continue
+        entry = best.get(op)
+        if entry is None or (ver < entry[0] if op in _LT_OPS else ver > entry[0]):
+            best[op] = (ver, 1)
+        elif ver == entry[0]:
+            best[op] = (entry[0], entry[1] + 1)
+    return best
+
+
+def _keeps_bound(
+    op: str,
+    ver: version.Version,
+    best: dict[str, tuple[version.Version, int]],
+) -> bool:
+    """Whether a bound survives, given the tightest bounds per operator."""
+    best_ver, multiplicity = best[op]
+    if ver != best_ver or multiplicity > 1:
+        # A tighter bound with the same operator exists, or an equal bound
+        # spelled differently — either way this one is redundant
+        return False
+    sibling = best.get(_SIBLING_OP[op])
+    if sibling is None:
+        return True
+    sibling_ver = sibling[0]
+    # A strict bound beats an inclusive one at the same version
+    if op == "<":
+        return sibling_ver >= ver
+    if op == "<=":
+        return sibling_ver > ver
+    if op == ">":
+        return sibling_ver <= ver
+    return sibling_ver < ver  # op == ">="
+
+
+def _non_redundant_pinnings(valid_pinnings: list[str]) -> list[str]:
+    """Single-pass equivalent of filtering with `_is_redundant`.
+
+    Keeps only the tightest upper bound (``<``/``<=``) and tightest lower
+    bound (``>``/``>=``); other operators (e.g. ``!=``) are never redundant.
+    Matches `_is_redundant`'s tie-breaking: a strict bound beats an inclusive
+    one at the same version, and equal bounds spelled differently (e.g. ``<2``
+    and ``<2.0``) eliminate each other.
+    """
+    parsed = [_parse_pinning(pin) for pin in valid_pinnings]
+    best = _tightest_bounds(parsed)
+    return [
+        pin
+        for pin, (op, ver) in zip(valid_pinnings, parsed)
+        if op not in _SIBLING_OP or _keeps_bound(op, ver, best)
+    ]
+
+
+# First characters of the operators in `VALID_OPERATORS`
+_OPERATOR_PREFIXES = ("<", ">", "=", "!")
+
+
 def _is_valid_pinning(pinning: str) -> bool:
     """Checks if a version pinning string is valid."""
-    if any(op in pinning for op in VALID_OPERATORS):
-        try:
-            # Attempt to parse the version part of the pinning
-            _parse_pinning(pinning)
-            return True  # noqa: TRY300
-        except VersionConflictError:
-            # If parsing fails, the pinning is not valid
-            return False
-    # If the pinning doesn't contain any recognized operator, it's not valid
-    return False
+    if not pinning.lstrip().startswith(_OPERATOR_PREFIXES):
+        # If the pinning doesn't start with a recognized operator, it's not valid
+        return False
+    try:
+        # Attempt to parse the version part of the pinning
+        _parse_pinning(pinning)
+        return True  # noqa: TRY300
+    except VersionConflictError:
+        # If parsing fails, the pinning is not valid
+        return False
 
 
 def _deduplicate(pinnings: list[str]) -> list[str]:
@@ -270,13 +345,23 @@ def _split_pinnings(pinnings: list[str]) -> list[str]:
     return [_pin.lstrip().rstrip() for pin in pinnings for _pin in pin.split(",")]
 
 
-def combine_version_pinnings(pinnings: list[str], *, name: str | None = None) -> str:
-    """Combines a list of version pinnings into a single string."""
-    pinnings = [p for p in pinnings if p != ""]
-    pinnings = _split_pinnings(pinnings)
-    pinnings = _deduplicate(pinnings)
-    if len(pinnings) == 1:
-        return pinnings[0]
+def _single_pinning(pinnings: list[str]) -> str | None:
+    """Fast path for the overwhelmingly common single-pin case.
+
+    A lone comma-free pinning needs no splitting, deduplication, or
+    redundancy checks; return it stripped, or None when the slow path
+    is required.
+    """
+    if len(pinnings) != 1:
+        return None
+    pin = pinnings[0].strip()
+    if pin and "," not in pin:
+        return pin
+    return None
+
+
+def _validate_pinnings(pinnings: list[str], name: str | None) -> None:
+    """Raise `VersionConflictError` on pinnings that cannot be combined."""
     for pin in pinnings:
         if not _is_valid_pinning(pin):
             ops = ", ".join(VALID_OPERATORS)
@@ -291,7 +376,27 @@ def combine_version_pinnings(pinnings: list[str], *, name: str | None = None) ->
 
             raise VersionConflictError(msg)
 
-    valid_pinnings = [p.replace(" ", "") for p in pinnings]
+
+def combine_version_pinnings(pinnings: list[str], *, name: str | None = None) -> str:
+    """Combines a list of version pinnings into a single string."""
+    if not pinnings:
+        return ""
+    single = _single_pinning(pinnings)
+    if single is not None:
+        return single
+    pinnings = [p for p in pinnings if p != ""]
+    pinnings = _split_pinnings(pinnings)
+    pinnings = _deduplicate(pinnings)
+    if len(pinnings) == 1:
+        return pinnings[0]
+    _validate_pinnings(pinnings, name)
+
+    valid_pinnings = [p.replace(" ", "") if " " in p else p for p in pinnings]
+    # Deduplicate again after normalization: the same bound spelled with
+    # different whitespace (e.g. '<2' and '< 2') must collapse to a single
+    # entry here, or the redundancy reduction below would see two equal
+    # bounds that eliminate each other and silently drop the constraint.
+    valid_pinnings = _deduplicate(valid_pinnings)
     exact_pinnings = [p for p in valid_pinnings if p.startswith("=")]
     if len(exact_pinnings) > 1:
         pinnings_str = ", ".join(exact_pinnings)
@@ -316,9 +421,7 @@ def combine_version_pinnings(pinnings: list[str], *, name: str | None = None) ->
                     raise VersionConflictError(msg)
         return exact_pin
 
-    non_redundant_pinnings = [
-        pin for pin in valid_pinnings if not _is_redundant(pin, valid_pinnings)
-    ]
+    non_redundant_pinnings = _non_redundant_pinnings(valid_pinnings)
 
     for i, pin in enumerate(non_redundant_pinnings):
         for other_pin in non_redundant_pinnings[i + 1 :]:
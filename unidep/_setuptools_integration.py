@@ -66,16 +66,22 @@ def filter_python_dependencies(
     pip_deps = []
     for platform_data in resolved.values():
         to_process: dict[Platform | None, Spec] = {}  # platform -> Spec
+        # Collect pip specs and check whether they are all identical in
+        # a single pass, bailing out of the comparison on first mismatch.
+        first_spec: Spec | None = None
+        all_identical = True
         for _platform, sources in platform_data.items():
             pip_spec = sources.get("pip")
             if pip_spec:
+                if first_spec is None:
+                    first_spec = pip_spec
+                elif all_identical and pip_spec != first_spec:
+                    all_identical = False
                 to_process[_platform] = pip_spec
-        if not to_process:
+        if first_spec is None:
             continue
 
-        # Check if all Spec objects are identical
-        first_spec = next(iter(to_process.values()))
-        if all(spec == first_spec for spec in to_process.values()):
+        if all_identical:
             # Build a single combined environment marker
             dep_str = first_spec.name_with_pin(is_pip=True)
             if _platform is not None:
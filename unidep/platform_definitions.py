@@ -5,6 +5,7 @@ Types and definitions for platforms, selectors, and markers.
 
 from __future__ import annotations
 
+import functools
 import sys
 from typing import NamedTuple, cast
 
@@ -100,6 +101,13 @@ def platforms_from_selector(selector: str) -> list[Platform]:
 
     For example, selector can be ``'linux64 win64'`` or ``'osx'``.
     """
+    # Return a fresh list so callers may mutate it without
+    # corrupting the cached tuple.
+    return list(_platforms_from_selector(selector))
+
+
+@functools.lru_cache(maxsize=None)
+def _platforms_from_selector(selector: str) -> tuple[Platform, ...]:
     # we support a very limited set of selectors that adhere to platform only
     # refs:
     # https://docs.conda.io/projects/conda-build/en/latest/resources/define-metadata.html#preprocessing-selectors
@@ -108,7 +116,7 @@ def platforms_from_selector(selector: str) -> list[Platform]:
     for s in selector.split():
         s = cast(Selector, s)
         platforms |= set(PLATFORM_SELECTOR_MAP_REVERSE[s])
-    return sorted(platforms)
+    return tuple(sorted(platforms))
 
 
 class Spec(NamedTuple):
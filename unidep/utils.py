@@ -6,6 +6,7 @@ This module provides utility functions used throughout the package.
 from __future__ import annotations
 
 import codecs
+import functools
 import platform
 import re
 import sys
@@ -40,32 +41,35 @@ def add_comment_to_file(
     """Add a comment to the top of a file."""
     if extra_lines is None:
         extra_lines = []
-    with open(filename, "r+") as f:  # noqa: PTH123
-        content = f.read()
-        f.seek(0, 0)
-        command_line_args = " ".join(sys.argv[1:])
-        txt = [
-            f"# This file is created and managed by `unidep` {__version__}.",
-            "# For details see https://github.com/basnijholt/unidep",
-            f"# File generated with: `unidep {command_line_args}`",
-            *extra_lines,
-        ]
-        content = "\n".join(txt) + "\n\n" + content
-        f.write(content)
+    path = Path(filename)
+    command_line_args = " ".join(sys.argv[1:])
+    txt = [
+        f"# This file is created and managed by `unidep` {__version__}.",
+        "# For details see https://github.com/basnijholt/unidep",
+        f"# File generated with: `unidep {command_line_args}`",
+        *extra_lines,
+    ]
+    content = "\n".join(txt) + "\n\n" + path.read_text()
+    path.write_text(content)
 
 
 def remove_top_comments(filename: str | Path) -> None:
     """Removes the top comments (lines starting with '#') from a file."""
-    with open(filename) as file:  # noqa: PTH123
-        lines = file.readlines()
-
-    first_non_comment = next(
-        (i for i, line in enumerate(lines) if not line.strip().startswith("#")),
-        len(lines),
-    )
-    content_without_comments = lines[first_non_comment:]
-    with open(filename, "w") as file:  # noqa: PTH123
-        file.writelines(content_without_comments)
+    with open(filename, "rb+") as file:  # noqa: PTH123
+        # Scan for the byte offset of the first non-comment line, then
+        # shift the tail to the front instead of rewriting line by line.
+        offset = 0
+        for line in file:
+            if not line.strip().startswith(b"#"):
+                break
+            offset += len(line)
+        if offset == 0:
+            return
+        file.seek(offset)
+        tail = file.read()
+        file.seek(0)
+        file.write(tail)
+        file.truncate()
 
 
 def escape_unicode(string: str) -> str:
@@ -93,10 +97,14 @@ def is_pip_installable(folder: str | Path) -> bool:  # pragma: no cover
                 pyproject_data = tomllib.load(file)
                 return "build-system" in pyproject_data
         else:
-            with pyproject_path.open("r") as file:
-                for line in file:
-                    if line.strip().startswith("[build-system]"):
-                        return True
+            # Single C-level scan over the raw bytes; only fall back to
+            # the per-line check when the table header appears at all.
+            data = pyproject_path.read_bytes()
+            if b"[build-system]" in data:
+                return any(
+                    line.strip().startswith(b"[build-system]")
+                    for line in data.splitlines()
+                )
     return False
 
 
@@ -104,33 +112,39 @@ class UnsupportedPlatformError(Exception):
     """Raised when the current platform is not supported."""
 
 
+# (system, architecture) -> Platform; Windows is special-cased below
+# because any 64-bit architecture maps to `win-64`.
+_PLATFORM_MAP: dict[tuple[str, str], Platform] = {
+    ("linux", "x86_64"): "linux-64",
+    ("linux", "aarch64"): "linux-aarch64",
+    ("linux", "ppc64le"): "linux-ppc64le",
+    ("darwin", "x86_64"): "osx-64",
+    ("darwin", "arm64"): "osx-arm64",
+}
+
+_SYSTEM_NAMES = {"linux": "Linux", "darwin": "macOS", "windows": "Windows"}
+
+
 def identify_current_platform() -> Platform:
     """Detect the current platform."""
-    system = platform.system().lower()
-    architecture = platform.machine().lower()
-
-    if system == "linux":
-        if architecture == "x86_64":
-            return "linux-64"
-        if architecture == "aarch64":
-            return "linux-aarch64"
-        if architecture == "ppc64le":
-            return "linux-ppc64le"
-        msg = f"Unsupported Linux architecture `{architecture}`"
-        raise UnsupportedPlatformError(msg)
-    if system == "darwin":
-        if architecture == "x86_64":
-            return "osx-64"
-        if architecture == "arm64":
-            return "osx-arm64"
-        msg = f"Unsupported macOS architecture `{architecture}`"
-        raise UnsupportedPlatformError(msg)
-    if system == "windows":
-        if "64" in architecture:
-            return "win-64"
-        msg = f"Unsupported Windows architecture `{architecture}`"
-        raise UnsupportedPlatformError(msg)
-    msg = f"Unsupported operating system `{system}` with architecture `{architecture}`"
+    return _identify_platform(platform.system().lower(), platform.machine().lower())
+
+
+@functools.lru_cache(maxsize=None)
+def _identify_platform(system: str, architecture: str) -> Platform:
+    _platform = _PLATFORM_MAP.get((system, architecture))
+    if _platform is not None:
+        return _platform
+    if system == "windows" and "64" in architecture:
+        return "win-64"
+    system_name = _SYSTEM_NAMES.get(system)
+    if system_name is not None:
+        msg = f"Unsupported {system_name} architecture `{architecture}`"
+    else:
+        msg = (
+            f"Unsupported operating system `{system}`"
+            f" with architecture `{architecture}`"
+        )
     raise UnsupportedPlatformError(msg)
 
 
@@ -138,14 +152,22 @@ def build_pep508_environment_marker(
     platforms: list[Platform | tuple[Platform, ...]],
 ) -> str:
     """Generate a PEP 508 selector for a list of platforms."""
-    sorted_platforms = tuple(sorted(platforms))
+    return _build_pep508_environment_marker(tuple(sorted(platforms)))
+
+
+@functools.lru_cache(maxsize=None)
+def _build_pep508_environment_marker(
+    sorted_platforms: tuple[Platform | tuple[Platform, ...], ...],
+) -> str:
     if sorted_platforms in PEP508_MARKERS:
         return PEP508_MARKERS[sorted_platforms]  # type: ignore[index]
-    environment_markers = [
+    environment_markers = tuple(
         PEP508_MARKERS[platform]
-        for platform in sorted(sorted_platforms)
+        for platform in sorted_platforms  # already sorted by the caller
         if platform in PEP508_MARKERS
-    ]
+    )
+    if len(environment_markers) == 1:
+        return environment_markers[0]
     return " or ".join(environment_markers)
 
 
@@ -158,50 +180,53 @@ class ParsedPackageStr(NamedTuple):
     selector: str | None = None
 
 
+# Character sets used by `parse_package_str`, which is called once per package
+# on the hot YAML parsing path, so it avoids regexes entirely.
+_NAME_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.-/",
+)
+_EXTRAS_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.,-",
+)
+_SELECTOR_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789 \t\n\r\f\v")
+
+
 def parse_package_str(package_str: str) -> ParsedPackageStr:
     """Splits a string into package name, version pinning, and platform selector."""
-    # Regex to match package name, version pinning, and optionally platform selector
-    # Note: the name_pattern currently allows for paths and extras, however,
+    # Note: the name currently allows for paths and extras, however,
     # paths cannot contain spaces or contain brackets.
-    name_pattern = r"[a-zA-Z0-9_.\-/]+(\[[a-zA-Z0-9_.,\-]+\])?"
-    version_pin_pattern = r".*?"
-    selector_pattern = r"[a-z0-9\s]+"
-    pattern = rf"({name_pattern})\s*({version_pin_pattern})?(:({selector_pattern}))?$"
-    match = re.match(pattern, package_str)
-
-    if match:
-        package_name = match.group(1).strip()
-        version_pin = match.group(3).strip() if match.group(3) else None
-        selector = match.group(5).strip() if match.group(5) else None
-
-        if selector is not None:
-            for s in selector.split():
-                validate_selector(cast(Selector, s))
-
-        return ParsedPackageStr(
-            package_name,
-            version_pin,
-            selector,
-        )
-
-    msg = f"Invalid package string: '{package_str}'"
-    raise ValueError(msg)
-
-
-def _simple_warning_format(
-    message: Warning | str,
-    category: type[Warning],  # noqa: ARG001
-    filename: str,
-    lineno: int,
-    line: str | None = None,  # noqa: ARG001
-) -> str:  # pragma: no cover
-    """Format warnings without code context."""
-    return (
-        f"---------------------\n"
-        f"⚠️  *** WARNING *** ⚠️\n"
-        f"{message}\n"
-        f"Location: {filename}:{lineno}\n"
-        f"---------------------\n"
+    rest, sep, selector_str = package_str.rpartition(":")
+    selector = None
+    if sep and selector_str and all(ch in _SELECTOR_CHARS for ch in selector_str):
+        selector = selector_str.strip()
+    else:
+        rest = package_str
+
+    # Scan the package name (optionally followed by bracketed extras)
+    i = 0
+    n = len(rest)
+    while i < n and rest[i] in _NAME_CHARS:
+        i += 1
+    if i == 0:
+        msg = f"Invalid package string: '{package_str}'"
+        raise ValueError(msg)
+    if i < n and rest[i] == "[":
+        j = rest.find("]", i + 1)
+        if j > i + 1 and all(ch in _EXTRAS_CHARS for ch in rest[i + 1 : j]):
+            i = j + 1
+
+    # Validate the selector only once the name is known to be valid, so
+    # invalid strings keep raising "Invalid package string" first.
+    if selector is not None:
+        for s in selector.split():
+            validate_selector(cast(Selector, s))
+
+    package_name = rest[:i]
+    version_pin = rest[i:].strip() or None
+    return ParsedPackageStr(
+        package_name,
+        version_pin,
+        selector,
     )
 
 
@@ -211,23 +236,31 @@ def warn(
     stacklevel: int = 1,
 ) -> None:
     """Emit a warning with a custom format specific to this package."""
-    original_format = warnings.formatwarning
-    warnings.formatwarning = _simple_warning_format
-    try:
-        warnings.warn(message, category, stacklevel=stacklevel + 1)
-    finally:
-        warnings.formatwarning = original_format
+    # Build the banner into the message itself instead of temporarily
+    # swapping the global `warnings.formatwarning` hook, which was both
+    # overhead per call and not thread-safe.
+    formatted = (
+        f"---------------------\n"
+        f"⚠️  *** WARNING *** ⚠️\n"
+        f"{message}\n"
+        f"---------------------"
+    )
+    warnings.warn(formatted, category, stacklevel=stacklevel + 1)
+
+
+_MULTI_BRACKET_RE = re.compile(r"#.*\].*\[")  # Detects multiple brackets
+_SEL_RE = re.compile(r"#\s*\[([^\[\]]+)\]")
 
 
 def selector_from_comment(comment: str) -> str | None:
     """Extract a valid selector from a comment."""
-    multiple_brackets_pat = re.compile(r"#.*\].*\[")  # Detects multiple brackets
-    if multiple_brackets_pat.search(comment):
+    if "#" not in comment:  # common case: no selector at all
+        return None
+    if _MULTI_BRACKET_RE.search(comment):
         msg = f"Multiple bracketed selectors found in comment: '{comment}'"
         raise ValueError(msg)
 
-    sel_pat = re.compile(r"#\s*\[([^\[\]]+)\]")
-    m = sel_pat.search(comment)
+    m = _SEL_RE.search(comment)
     if not m:
         return None
     selectors = m.group(1).strip().split()